@@ -7,28 +7,30 @@
 
 import sys
 import re
+from contextlib import contextmanager
 import time
 import warnings
 from datetime import datetime
-from iso639 import languages
+from multiprocessing import Pool
+import threading
 import argparse
+from future.utils import text_type
 from rdflib.namespace import OWL, RDF, SKOS, DCTERMS, XSD, Namespace
 from rdflib import URIRef, Literal, Graph, BNode
-from otsrdflib import OrderedTurtleSerializer
+from lxml import etree
 import json
-import rdflib_jsonld.serializer as json_ld
 import pkg_resources
-import skosify
 
 import logging
 import logging.handlers
 
 from . import __version__
-from .constants import Constants
 from .element import Element
 from .record import InvalidRecordError, ClassificationRecord, AuthorityRecord
 from .reader import MarcFileReader
+from .util import json_dumps, lru_cache
 from .vocabularies import Vocabularies
+from .writer import StreamingTurtleWriter, TripleList
 
 logging.captureWarnings(True)
 warnings.simplefilter('always', DeprecationWarning)
@@ -46,116 +48,302 @@ logger.addHandler(console_handler)
 WD = Namespace('http://data.ub.uio.no/webdewey-terms#')
 MADS = Namespace('http://www.loc.gov/mads/rdf/v1#')
 
+# Terms used for every record. Looking up a term on a namespace object is
+# relatively slow, so we do it once here.
+RDF_TYPE = RDF.type
+RDF_FIRST = RDF.first
+RDF_REST = RDF.rest
+RDF_NIL = RDF.nil
+SKOS_CONCEPT = SKOS.Concept
+SKOS_TOP_CONCEPT_OF = SKOS.topConceptOf
+SKOS_IN_SCHEME = SKOS.inScheme
+SKOS_NOTATION = SKOS.notation
+SKOS_PREF_LABEL = SKOS.prefLabel
+SKOS_ALT_LABEL = SKOS.altLabel
+SKOS_DEFINITION = SKOS.definition
+SKOS_NOTE = SKOS.note
+SKOS_EDITORIAL_NOTE = SKOS.editorialNote
+SKOS_SCOPE_NOTE = SKOS.scopeNote
+SKOS_HISTORY_NOTE = SKOS.historyNote
+SKOS_CHANGE_NOTE = SKOS.changeNote
+SKOS_EXAMPLE = SKOS.example
+DCTERMS_CREATED = DCTERMS.created
+DCTERMS_MODIFIED = DCTERMS.modified
+DCTERMS_IDENTIFIER = DCTERMS.identifier
+OWL_DEPRECATED = OWL.deprecated
+MADS_COMPONENT_LIST = MADS.componentList
+XSD_DATE = XSD.date
+TRUE = Literal(True)
+
+# Buffer size for the output file
+OUTPUT_BUFFER_SIZE = 4 * 1024 * 1024
+
+JSKOS_CONTEXT = u'https://gbv.github.io/jskos/context.json'
+
+# Relations with a key of their own in the JSKOS context
+JSKOS_RELATIONS = {
+    SKOS.broader: 'broader',
+    SKOS.narrower: 'narrower',
+    SKOS.related: 'related',
+    SKOS.broaderTransitive: 'ancestors',
+}
+
+# Scheme URIs, parent URIs and component URIs are repeated across many records,
+# so we cache the URIRef objects rather than creating new ones every time.
+uriref = lru_cache(maxsize=100000)(URIRef)
+
+
+@lru_cache(maxsize=10000)
+def date_literal(value):
+    return Literal(value, datatype=XSD_DATE)
+
+
+# Terms for the WebDewey properties, created on first use
+WD_TERMS = {}
+
+
+def wd_term(key):
+    term = WD_TERMS.get(key)
+    if term is None:
+        term = WD_TERMS[key] = WD[key]
+    return term
+
+
+# Sort key generators for the OrderedTurtleSerializer. The patterns are
+# compiled here since the serializer evaluates them for every concept.
+TURTLE_SORTERS = [
+    (re.compile(r'/([0-9A-Z\-]+)--([0-9.\-;:]+)/e'), lambda x: 'C{}--{}'.format(x[0], x[1])),  # table numbers
+    (re.compile(r'/([0-9.\-;:]+)/e'), lambda x: 'B' + x[0]),  # standard schedule numbers
+    (re.compile(r'^(.+)$'), lambda x: 'A' + x[0]),  # fallback
+]
+
 
 def add_record_to_graph(graph, record, options):
     # Add record to graph
 
     # logger.debug('Adding: %s', record.uri)
 
+    include_altlabels = options.get('include_altlabels')
+    include_notes = not options.get('exclude_notes')
+    include_components = options.get('include_components')
+    include_webdewey = options.get('include_webdewey')
+
     # Strictly, we do not need to explicitly state here that <A> and <B> are instances
     # of skos:Concept, because such statements are entailed by the definition
     # of skos:semanticRelation.
     record_uri = URIRef(record.uri)
 
-    graph.add((record_uri, RDF.type, SKOS.Concept))
+    # Collect the triples for the record and add them in one batch at the end
+    triples = []
+    add = triples.append
+
+    add((record_uri, RDF_TYPE, SKOS_CONCEPT))
 
     # Add skos:topConceptOf or skos:inScheme
     for scheme_uri in record.scheme_uris:
         if record.is_top_concept:
-            graph.add((record_uri, SKOS.topConceptOf, URIRef(scheme_uri)))
+            add((record_uri, SKOS_TOP_CONCEPT_OF, uriref(scheme_uri)))
         else:
-            graph.add((record_uri, SKOS.inScheme, URIRef(scheme_uri)))
+            add((record_uri, SKOS_IN_SCHEME, uriref(scheme_uri)))
 
     if record.created is not None:
-        graph.add((record_uri, DCTERMS.created, Literal(record.created.strftime('%F'), datatype=XSD.date)))
+        add((record_uri, DCTERMS_CREATED, date_literal(record.created.date().isoformat())))
 
     if record.modified is not None:
-        graph.add((record_uri, DCTERMS.modified, Literal(record.modified.strftime('%F'), datatype=XSD.date)))
+        add((record_uri, DCTERMS_MODIFIED, date_literal(record.modified.date().isoformat())))
 
     # Add classification number as skos:notation
-    if record.notation:
-        if record.record_type == Constants.TABLE_RECORD:  # OBS! Sjekk add tables
-            graph.add((record_uri, SKOS.notation, Literal('T' + record.notation)))
-        else:
-            graph.add((record_uri, SKOS.notation, Literal(record.notation)))
+    if record.notation_literal is not None:
+        add((record_uri, SKOS_NOTATION, record.notation_literal))
 
     # Add local control number as dcterms:identifier
     if record.control_number:
-        graph.add((record_uri, DCTERMS.identifier, Literal(record.control_number)))
+        add((record_uri, DCTERMS_IDENTIFIER, Literal(record.control_number)))
 
     # Add caption as skos:prefLabel
+    alt_labels = record.altLabel
     if record.prefLabel:
-        graph.add((record_uri, SKOS.prefLabel, Literal(record.prefLabel, lang=record.lang)))
-    elif options.get('include_webdewey') and len(record.altLabel) != 0:
+        add((record_uri, SKOS_PREF_LABEL, Literal(record.prefLabel, lang=record.lang)))
+    elif include_webdewey and len(alt_labels) != 0:
         # If the --webdewey flag is set, we will use the first index term as prefLabel
-        caption = record.altLabel.pop(0)['term']
-        if len(record.altLabel) != 0:
+        caption = alt_labels[0]
+        alt_labels = alt_labels[1:]
+        if len(alt_labels) != 0:
             caption = caption + ', …'
-        graph.add((record_uri, SKOS.prefLabel, Literal(caption, lang=record.lang)))
+        add((record_uri, SKOS_PREF_LABEL, Literal(caption, lang=record.lang)))
 
     # Add index terms as skos:altLabel
-    if options.get('include_altlabels'):
-        for label in record.altLabel:
-            graph.add((record_uri, SKOS.altLabel, Literal(label['term'], lang=record.lang)))
+    if include_altlabels:
+        for term in alt_labels:
+            add((record_uri, SKOS_ALT_LABEL, Literal(term, lang=record.lang)))
 
     # Add relations (SKOS:broader, SKOS:narrower, SKOS:xxxMatch, etc.)
     for relation in record.relations:
         if relation.get('uri') is not None:
-            graph.add((record_uri, relation.get('relation'), URIRef(relation['uri'])))
+            add((record_uri, relation.get('relation'), uriref(relation['uri'])))
 
     # Add notes
-    if not options.get('exclude_notes'):
+    if include_notes:
         for note in record.definition:
-            graph.add((record_uri, SKOS.definition, Literal(note, lang=record.lang)))
+            add((record_uri, SKOS_DEFINITION, Literal(note, lang=record.lang)))
 
         for note in record.note:
-            graph.add((record_uri, SKOS.note, Literal(note, lang=record.lang)))
+            add((record_uri, SKOS_NOTE, Literal(note, lang=record.lang)))
 
         for note in record.editorialNote:
-            graph.add((record_uri, SKOS.editorialNote, Literal(note, lang=record.lang)))
+            add((record_uri, SKOS_EDITORIAL_NOTE, Literal(note, lang=record.lang)))
 
         for note in record.scopeNote:
-            graph.add((record_uri, SKOS.scopeNote, Literal(note, lang=record.lang)))
+            add((record_uri, SKOS_SCOPE_NOTE, Literal(note, lang=record.lang)))
 
         for note in record.historyNote:
-            graph.add((record_uri, SKOS.historyNote, Literal(note, lang=record.lang)))
+            add((record_uri, SKOS_HISTORY_NOTE, Literal(note, lang=record.lang)))
 
         for note in record.changeNote:
-            graph.add((record_uri, SKOS.changeNote, Literal(note, lang=record.lang)))
+            add((record_uri, SKOS_CHANGE_NOTE, Literal(note, lang=record.lang)))
 
         for note in record.example:
-            graph.add((record_uri, SKOS.example, Literal(note, lang=record.lang)))
+            add((record_uri, SKOS_EXAMPLE, Literal(note, lang=record.lang)))
 
     # Deprecated?
     if record.deprecated:
-        graph.add((record_uri, OWL.deprecated, Literal(True)))
-
-    # Add synthesized number components
-    if options.get('include_components') and len(record.components) != 0:
-        component = record.components.pop(0)
-        component_uri = URIRef(record.scheme.uri('concept', collection='class', object=component))
-        b1 = BNode()
-        graph.add((record_uri, MADS.componentList, b1))
-        graph.add((b1, RDF.first, component_uri))
+        add((record_uri, OWL_DEPRECATED, TRUE))
 
-        for component in record.components:
-            component_uri = URIRef(record.scheme.uri('concept', collection='class', object=component))
-            b2 = BNode()
-            graph.add((b1, RDF.rest, b2))
-            graph.add((b2, RDF.first, component_uri))
-            b1 = b2
+    # Add synthesized number components as an RDF list
+    if include_components and len(record.components) != 0:
+        # Generating a random blank node ID is relatively expensive, so we only do it
+        # for the head of the list and derive the IDs of the other nodes from it.
+        head = BNode()
+        nodes = [head] + [BNode('%s_%d' % (head, n)) for n in range(1, len(record.components))]
+        add((record_uri, MADS_COMPONENT_LIST, head))
 
-        graph.add((b1, RDF.rest, RDF.nil))
+        for node, rest, component in zip(nodes, nodes[1:] + [RDF_NIL], record.components):
+            component_uri = uriref(record.scheme.uri('concept', collection='class', object=component))
+            add((node, RDF_FIRST, component_uri))
+            add((node, RDF_REST, rest))
 
     # Add webDewey extras
+    if include_webdewey:
+        for key, values in record.webDeweyExtras.items():
+            for value in values:
+                add((record_uri, wd_term(key), Literal(value, lang=record.lang)))
+
+    graph.addN((s, p, o, graph) for s, p, o in triples)
+    return len(triples)
+
+
+def record_to_jskos(record, options):
+    """Convert a parsed record to a JSKOS object.
+
+    The result is the same as when the record is added to a graph with
+    add_record_to_graph() and the graph is serialized as JSON-LD using the
+    JSKOS context, but no graph is needed, so records can be written one by one.
+    """
+    lang = record.lang
+    jskos = {
+        'uri': record.uri,
+        'type': [str(SKOS_CONCEPT)],
+    }
+    # Keys that are not defined in the JSKOS context. Like JSON-LD compaction
+    # does, we use the full property URI and only use an array for multiple values.
+    single_valued = set()
+
+    def add(key, value):
+        values = jskos.setdefault(key, [])
+        if value not in values:  # A graph doesn't hold duplicate triples either
+            values.append(value)
+
+    def add_other(key, value):
+        add(key, value)
+        single_valued.add(key)
+
+    def add_label(key, value):
+        values = jskos.setdefault(key, {}).setdefault(lang, [])
+        if value not in values:
+            values.append(value)
+
+    # Add skos:topConceptOf or skos:inScheme
+    for scheme_uri in record.scheme_uris:
+        add('topConceptOf' if record.is_top_concept else 'inScheme', {'uri': scheme_uri})
+
+    if record.created is not None:
+        jskos['created'] = record.created.date().isoformat()
+
+    if record.modified is not None:
+        jskos['modified'] = record.modified.date().isoformat()
+
+    if record.notation_literal is not None:
+        add('notation', text_type(record.notation_literal))
+
+    if record.control_number:
+        add('identifier', record.control_number)
+
+    alt_labels = list(record.altLabel)
+    if record.prefLabel:
+        add_label('prefLabel', record.prefLabel)
+    elif options.get('include_webdewey') and len(alt_labels) != 0:
+        # If the --webdewey flag is set, we will use the first index term as prefLabel
+        caption = alt_labels.pop(0)
+        if len(alt_labels) != 0:
+            caption = caption + ', …'
+        add_label('prefLabel', caption)
+
+    if options.get('include_altlabels'):
+        for label in alt_labels:
+            add_label('altLabel', label)
+
+    for relation in record.relations:
+        if relation.get('uri') is not None:
+            key = JSKOS_RELATIONS.get(relation['relation'])
+            if key is not None:
+                add(key, {'uri': relation['uri']})
+            else:
+                add_other(str(relation['relation']), {'uri': relation['uri']})
+
+    if not options.get('exclude_notes'):
+        for key in ['definition', 'editorialNote', 'scopeNote', 'historyNote', 'changeNote', 'example']:
+            for note in getattr(record, key):
+                add_label(key, note)
+
+        for note in record.note:
+            add_other(str(SKOS_NOTE), {'@language': lang, '@value': note})
+
+    if record.deprecated:
+        jskos[str(OWL_DEPRECATED)] = True
+
+    if options.get('include_components') and len(record.components) != 0:
+        jskos['memberList'] = [
+            {'uri': record.scheme.uri('concept', collection='class', object=component)}
+            for component in record.components
+        ]
+
     if options.get('include_webdewey'):
         for key, values in record.webDeweyExtras.items():
             for value in values:
-                graph.add((record_uri, WD[key], Literal(value, lang=record.lang)))
+                add_other(str(wd_term(key)), {'@language': lang, '@value': value})
 
+    for key, value in jskos.items():
+        if key in single_valued and len(value) == 1:
+            jskos[key] = value[0]
+        elif isinstance(value, dict):
+            # Language maps
+            for label_lang, labels in value.items():
+                if len(labels) == 1:
+                    value[label_lang] = labels[0]
 
-def process_record(graph, rec, **kwargs):
-    """Convert a single MARC21 classification or authority record to RDF."""
+    return jskos
+
+
+def record_to_triples(record, options):
+    triples = TripleList()
+    add_record_to_graph(triples, record, options)
+    return triples
+
+
+def parse_record(rec, **kwargs):
+    """Parse a single MARC21 classification or authority record.
+
+    Returns None if the record should not be included in the output."""
     el = Element(rec)
     leader = el.text('mx:leader')
     if leader is None:
@@ -174,20 +362,134 @@ def process_record(graph, rec, **kwargs):
                                  control_number=el.text('mx:controlfield[@tag="001"]'))
 
     if rec.is_public():
-        add_record_to_graph(graph, rec, kwargs)
+        return rec
 
 
-def process_records(records, graph=None, **options):
+def process_record(graph, rec, **kwargs):
+    """Convert a single MARC21 classification or authority record to RDF.
+
+    Returns the number of triples added to the graph."""
+    rec = parse_record(rec, **kwargs)
+    if rec is None:
+        return 0
+    return add_record_to_graph(graph, rec, kwargs)
+
+
+# Conversion function and options for the worker processes, set by init_worker()
+worker_convert = None
+worker_options = None
+
+
+def init_worker(convert, options):
+    global worker_convert, worker_options
+    worker_convert = convert
+    worker_options = options
+
+
+def convert_serialized_record(data):
+    # Runs in a worker process. Returns the converted record, or the error
+    # if the record was invalid.
+    try:
+        rec = parse_record(data, **worker_options)
+    except InvalidRecordError as e:
+        return None, (e.control_number, str(e))
+    if rec is None:
+        return None, None
+    return worker_convert(rec, worker_options), None
+
+
+def convert_records_in_pool(records, convert, processes, options, chunksize=64):
+    # Records are independent of each other, so they can be converted in parallel.
+    # Since lxml elements cannot be pickled, the records are serialized before
+    # being sent to the workers. The pool reads and serializes records in its
+    # own thread while the workers convert the previous ones. To keep memory
+    # usage bounded for large files, it may only read a limited number of
+    # records ahead of the results we have consumed.
+    slots = threading.Semaphore(processes * chunksize * 4)
+    stopped = threading.Event()
+    errors = []
+
+    def serialized_records():
+        # If reading fails (e.g. on malformed XML), we stop feeding the pool and
+        # keep the exception to raise it in the consuming thread. Otherwise the
+        # pool would try to pass it on to a worker, and XMLSyntaxError cannot
+        # be pickled.
+        try:
+            for record in records:
+                slots.acquire()
+                if stopped.is_set():
+                    return
+                yield etree.tostring(record)
+        except Exception as e:
+            errors.append(e)
+
+    pool = Pool(processes, initializer=init_worker, initargs=(convert, options))
+    try:
+        for result in pool.imap(convert_serialized_record, serialized_records(), chunksize):
+            slots.release()
+            yield result
+        if errors:
+            raise errors[0]
+    finally:
+        # Wake up the reader if it is waiting for a slot, so the pool can shut down
+        stopped.set()
+        slots.release()
+        pool.terminate()
+
+
+def convert_records(records, convert, **options):
+    """Parse the records and yield convert(record, options) for each record to be included.
+
+    Invalid records are logged and skipped. If the 'processes' option is larger
+    than 1, the records are converted in that many worker processes. The
+    convert function must then be a module-level function, so it can be pickled."""
     n = 0
+    processes = options.get('processes') or 1
+    if processes > 1:
+        for result, error in convert_records_in_pool(records, convert, processes, options):
+            n += 1
+            if error is not None:
+                control_number, message = error
+                logger.warning('Ignoring record %s: %s', control_number or '#%d' % n, message)
+            elif result is not None:
+                yield result
+    else:
+        for record in records:
+            n += 1
+            try:
+                rec = parse_record(record, **options)
+            except InvalidRecordError as e:
+                record_id = e.control_number or '#%d' % n
+                logger.warning('Ignoring record %s: %s', record_id, e)
+                continue
+            if rec is not None:
+                yield convert(rec, options)
+
+
+def add_records(graph, records, **options):
+    """Convert the records and add them to the graph.
+
+    Returns the number of triples added, so that callers don't need to
+    inspect the graph to find out if anything was converted."""
+    added = 0
+    for triples in convert_records(records, record_to_triples, **options):
+        graph.addN((s, p, o, graph) for s, p, o in triples)
+        added += len(triples)
+    return added
+
+
+def process_records(records, graph=None, **options):
     if graph is None:
         graph = Graph()
-    for record in records:
-        n += 1
-        try:
-            process_record(graph, record, **options)
-        except InvalidRecordError as e:
-            record_id = e.control_number or '#%d' % n
-            logger.warning('Ignoring record %s: %s', record_id, e)
+
+    add_records(graph, records, **options)
+    return postprocess_graph(graph, **options)
+
+
+def postprocess_graph(graph, **options):
+    # Run the optional SKOS inference and Skosify steps. Returns the graph.
+    if options.get('expand') or options.get('skosify'):
+        import skosify
 
     if options.get('expand'):
         logger.info('Expanding RDF via basic SKOS inference')
@@ -203,6 +505,65 @@ def process_records(records, graph=None, **options):
     return graph
 
 
+@contextmanager
+def output_file(filename):
+    # Opens the output file for binary writing, or uses standard output
+    # if no filename (or '-') is given.
+    if filename and filename != '-':
+        # Use a large buffer, since we write many small chunks
+        with open(filename, 'wb', OUTPUT_BUFFER_SIZE) as out_file:
+            yield out_file
+    else:
+        if (sys.version_info > (3, 0)):
+            out_file = sys.stdout.buffer
+        else:
+            out_file = sys.stdout
+        try:
+            yield out_file
+        finally:
+            out_file.flush()
+
+
+def serialize(graph, out_file, outformat):
+    # The serializers are imported here so that they are only loaded for the format in use
+    if outformat == 'turtle':
+        # @TODO: Perhaps use OrderedTurtleSerializer if available, but fallback to default Turtle serializer if not?
+        from otsrdflib import OrderedTurtleSerializer
+        serializer = OrderedTurtleSerializer(graph)
+
+        serializer.class_order = [
+            SKOS.ConceptScheme,
+            SKOS.Concept,
+        ]
+        serializer.sorters = TURTLE_SORTERS
+
+        serializer.serialize(out_file)
+
+    elif outformat in ['jskos', 'ndjson']:
+        import rdflib_jsonld.serializer as json_ld
+        s = pkg_resources.resource_string(__name__, 'jskos-context.json').decode('utf-8')
+        context = json.loads(s)
+        jskos = json_ld.from_rdf(graph, context)
+        if outformat == 'jskos':
+            jskos['@context'] = JSKOS_CONTEXT
+            out_file.write(json_dumps(jskos, indent=True))
+        else:
+            for record in jskos['@graph'] if '@graph' in jskos else [jskos]:
+                record['@context'] = JSKOS_CONTEXT
+                out_file.write(json_dumps(record) + b'\n')
+
+
+def positive_int(value):
+    # Argument type for options that take a number of at least 1
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError('must be a positive integer, got %r' % value)
+    return number
+
+
 def main():
 
     parser = argparse.ArgumentParser(description='Convert MARC21 Classification to SKOS/RDF')
@@ -243,6 +604,12 @@ def main():
                         help='Use Skosify to infer skos:hasTopConcept, skos:narrower and skos:related')
     parser.add_argument('--skosify', dest='skosify',
                         help='Run Skosify with given configuration file')
+    parser.add_argument('--processes', dest='processes', metavar='N', type=positive_int, default=1,
+                        help='Number of worker processes used to convert the records (default: 1).')
+    parser.add_argument('--stream', dest='stream', action='store_true',
+                        help='Write turtle output while the records are being processed, without building '
+                             'an in-memory graph first. The concepts are written in input order rather than sorted. '
+                             'Cannot be combined with --expand or --skosify.')
 
     parser.add_argument('-l', '--list-schemes', dest='list_schemes', action='store_true',
                         help='List default concept schemes.')
@@ -280,6 +647,12 @@ def main():
     elif args.outformat not in supported_formats:
         raise ValueError("Format not supported, must be one of '%s'." % "', '".join(supported_formats))
 
+    if args.stream:
+        if args.outformat != 'turtle':
+            raise ValueError('--stream is only supported for the turtle format')
+        if args.expand or args.skosify:
+            raise ValueError('--stream cannot be combined with --expand or --skosify')
+
     graph = Graph()
     for filename in args.include:
         if args.outformat == 'turtle':
@@ -294,9 +667,13 @@ def main():
     nm.bind('mads', MADS)
     nm.bind('owl', OWL)
 
+    # Set the level on the logger too, so that debug messages are discarded
+    # before any formatting is done.
     if args.verbose:
+        logger.setLevel(logging.DEBUG)
         console_handler.setLevel(logging.DEBUG)
     else:
+        logger.setLevel(logging.INFO)
         console_handler.setLevel(logging.INFO)
 
     if args.infile is None:
@@ -311,51 +688,47 @@ def main():
         'skip_authority': args.skip_authority,
         'expand': args.expand,
         'skosify': args.skosify,
+        'processes': args.processes,
         'vocabularies': vocabularies
     }
 
+    to_file = args.outfile and args.outfile != '-'
     marc = MarcFileReader(args.infile)
-    graph = process_records(marc.records(), graph, **options)
-
-    if not graph:
-        logger.warning('RDF result is empty!')
-        return
 
-    if args.outfile and args.outfile != '-':
-        out_file = open(args.outfile, 'wb')
-    else:
-        if (sys.version_info > (3, 0)):
-            out_file = sys.stdout.buffer
-        else:
-            out_file = sys.stdout
-
-    if args.outformat == 'turtle':
-        # @TODO: Perhaps use OrderedTurtleSerializer if available, but fallback to default Turtle serializer if not?
-        serializer = OrderedTurtleSerializer(graph)
-
-        serializer.class_order = [
-            SKOS.ConceptScheme,
-            SKOS.Concept,
-        ]
-        serializer.sorters = [
-            (r'/([0-9A-Z\-]+)--([0-9.\-;:]+)/e', lambda x: 'C{}--{}'.format(x[0], x[1])),  # table numbers
-            (r'/([0-9.\-;:]+)/e', lambda x: 'B' + x[0]),  # standard schedule numbers
-            (r'^(.+)$', lambda x: 'A' + x[0]),  # fallback
-        ]
+    if args.outformat == 'ndjson' and not (args.include or args.expand or args.skosify):
+        # Nothing needs the complete graph, so each record can be converted
+        # to JSKOS and written as soon as it has been parsed.
+        n = 0
+        with output_file(args.outfile) as out_file:
+            for record in convert_records(marc.records(), record_to_jskos, **options):
+                record['@context'] = JSKOS_CONTEXT
+                out_file.write(json_dumps(record) + b'\n')
+                n += 1
+        if n == 0:
+            logger.warning('Result is empty!')
+            return
 
-        serializer.serialize(out_file)
+    elif args.stream:
+        with output_file(args.outfile) as out_file:
+            writer = StreamingTurtleWriter(out_file, graph.namespace_manager)
+            for subject in set(graph.subjects()):
+                writer.write_subject(subject, graph.predicate_objects(subject))
+            added = add_records(writer, marc.records(), **options)
+        if added == 0 and (not args.include or len(graph) == 0):
+            logger.warning('RDF result is empty!')
+            return
 
-    elif args.outformat in ['jskos', 'ndjson']:
-        s = pkg_resources.resource_string(__name__, 'jskos-context.json').decode('utf-8')
-        context = json.loads(s)
-        jskos = json_ld.from_rdf(graph, context)
-        if args.outformat == 'jskos':
-            jskos['@context'] = u'https://gbv.github.io/jskos/context.json'
-            out_file.write(json.dumps(jskos, sort_keys=True, indent=2).encode('utf-8'))
-        else:
-            for record in jskos['@graph'] if '@graph' in jskos else [jskos]:
-                record['@context'] = u'https://gbv.github.io/jskos/context.json'
-                out_file.write(json.dumps(record, sort_keys=True).encode('utf-8') + b'\n')
+    else:
+        # The output file is not opened until we know there is something to
+        # write, so that an existing file is not overwritten by an empty result.
+        added = add_records(graph, marc.records(), **options)
+        if added == 0 and (not args.include or len(graph) == 0):
+            # Triples from included files are still written if no records were converted
+            logger.warning('RDF result is empty!')
+            return
+        graph = postprocess_graph(graph, **options)
+        with output_file(args.outfile) as out_file:
+            serialize(graph, out_file, args.outformat)
 
-    if out_file != sys.stdout:
+    if to_file:
         logger.info('Wrote %s: %s' % (args.outformat, args.outfile))
@@ -1,8 +1,10 @@
 # encoding=utf8
 import logging
-import time
 from lxml import etree
 
+from .element import RECORD_TAG
+from .util import monotonic
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,11 +17,19 @@ class MarcFileReader:
     def records(self):
         logger.info('Parsing: %s', self.name)
         n = 0
-        t0 = time.time()
-        record_tag = '{http://www.loc.gov/MARC21/slim}record'
-        for _, record in etree.iterparse(self.name, tag=record_tag):
+        t0 = monotonic()
+        context = etree.iterparse(self.name, events=('end',), tag=RECORD_TAG, huge_tree=True)
+        for _, record in context:
             yield record
+
+            # Free the memory used by the record, and also drop the references
+            # the root element keeps to the already processed records, so that
+            # memory usage doesn't grow with the size of the file.
             record.clear()
+            while record.getprevious() is not None:
+                del record.getparent()[0]
+
             n += 1
-            if n % 500 == 0:
-                logger.info('Read %d records (%.f recs/sec)', n, (float(n) / (time.time() - t0)))
+            if n % 10000 == 0 and logger.isEnabledFor(logging.INFO):
+                logger.info('Read %d records (%.f recs/sec)', n, (float(n) / (monotonic() - t0)))
+        del context
@@ -3,7 +3,7 @@
 from datetime import datetime
 import logging
 from iso639 import languages
-from rdflib import URIRef
+from rdflib import URIRef, Literal
 from rdflib.namespace import SKOS
 
 from .constants import Constants
@@ -29,6 +29,16 @@ logger.addFilter(DuplicateFilter())
 
 class Record(object):
 
+    # Records are created for every MARC record in the input, so we declare
+    # the attributes up front to avoid a per-instance __dict__.
+    __slots__ = (
+        'record', 'vocabularies', 'scheme', 'uri', 'scheme_uris',
+        'control_number', 'control_number_identifier', 'created', 'modified',
+        'lang', 'notation', 'notation_literal', 'prefLabel', 'altLabel', 'definition', 'editorialNote',
+        'note', 'scopeNote', 'historyNote', 'changeNote', 'example', 'components',
+        'relations', 'webDeweyExtras', 'deprecated', 'is_top_concept',
+    )
+
     def __init__(self, record, options=None):
         options = options or {}
         if isinstance(record, Element):
@@ -56,6 +66,7 @@ class Record(object):
         self.deprecated = False
         self.is_top_concept = False
         self.notation = None
+        self.notation_literal = None
 
         self.vocabularies = options['vocabularies']
         try:
@@ -196,7 +207,7 @@ class Record(object):
 
         for heading in self.get_terms('7'):
             relation = None
-            for sf in heading['node'].all('mx:subfield'):
+            for sf in heading['node'].subfields():
                 if sf.get('code') == '4':
                     if is_uri(sf.text()):
                         relation = URIRef(sf.text())
@@ -240,6 +251,8 @@ class Record(object):
 
 class ClassificationRecord(Record):
 
+    __slots__ = ('table', 'record_type', 'number_type', 'display', 'synthesized')
+
     def __init__(self, record, options=None):
         options = options or {}
 
@@ -284,6 +297,13 @@ class ClassificationRecord(Record):
             else:
                 self.record_type = Constants.TABLE_RECORD
 
+        # The skos:notation value. Table numbers are prefixed with 'T'.
+        if self.notation:
+            if self.record_type == Constants.TABLE_RECORD:  # OBS! Sjekk add tables
+                self.notation_literal = Literal('T' + self.notation)
+            else:
+                self.notation_literal = Literal(self.notation)
+
         # Now we have enough information to generate URIs
         self.generate_uris()
         if parent_notation is not None:
@@ -389,9 +409,7 @@ class ClassificationRecord(Record):
 
         # 7XX Index terms
         for heading in self.get_terms('7'):
-            self.altLabel.append({
-                'term': heading['value']
-            })
+            self.altLabel.append(heading['value'])
 
         # 7XX: Heading Linking Entries
         for mapping in self.get_mappings():
@@ -411,7 +429,7 @@ class ClassificationRecord(Record):
 
             table = ''
             rootno = ''
-            for sf in entry.all('mx:subfield'):
+            for sf in entry.subfields():
                 if sf.get('code') == 'b':    # Base number
                     if len(self.components) == 0:
                         self.components.append(table + sf.text())
@@ -514,7 +532,7 @@ class ClassificationRecord(Record):
         is_top_concept = True
         parts = []
 
-        buf = [{'code': sf.get('code'), 'value': sf.text()} for sf in element.all('mx:subfield')]
+        buf = [{'code': sf.get('code'), 'value': sf.text()} for sf in element.subfields()]
 
         mode = 'notation'
         for idx, subfield in enumerate(buf):
@@ -593,6 +611,8 @@ class ClassificationRecord(Record):
 
 class AuthorityRecord(Record):
 
+    __slots__ = ()
+
     def __init__(self, record, options=None):
         super(AuthorityRecord, self).__init__(record, options)
 
@@ -672,9 +692,7 @@ class AuthorityRecord(Record):
 
         # 4XX: See From Tracings
         for heading in self.get_terms('4'):
-            self.altLabel.append({
-                'term': heading['value']
-            })
+            self.altLabel.append(heading['value'])
 
         # 5XX: See Also From Tracings
         for heading in self.get_terms('5'):
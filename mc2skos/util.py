@@ -1,3 +1,11 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
 def is_uri(value):
     return value.startswith('http://') or value.startswith('https://')
 
@@ -7,3 +15,29 @@ def is_str(obj):
         return isinstance(obj, basestring)  # Python 2.x
     except NameError:
         return isinstance(obj, str)  # Python 3.x
+
+
+try:
+    from functools import lru_cache
+except ImportError:  # Python 2.x
+    def lru_cache(maxsize=128):
+        # No-op fallback: results are simply not cached
+        def decorator(fn):
+            return fn
+        return decorator
+
+try:
+    from time import monotonic
+except ImportError:  # Python 2.x
+    from time import time as monotonic
+
+
+def json_dumps(obj, indent=False):
+    # Serialize obj as UTF-8 encoded JSON with sorted keys, using the much
+    # faster orjson library if it is installed.
+    if orjson is not None:
+        option = orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, sort_keys=True, indent=2 if indent else None).encode('utf-8')
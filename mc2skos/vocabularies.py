@@ -5,6 +5,12 @@ from .error import UnknownSchemeError
 from .record import AuthorityRecord, ClassificationRecord
 from .util import is_str
 
+# A {param[start:end]:formatter} field in a URI template
+TEMPLATE_FIELD = re.compile(r'\{(?P<param>[a-z_]+)(?:\[(?P<start>\d+)?:(?P<end>\d+)?\])?(?P<formatter>[:!][^\}]+)?\}')
+
+# Organization prefix in parenthesis, like "(NO-TrBIB)"
+ORG_PREFIX = re.compile(r'^\(.+\)(.+)$')
+
 
 @python_2_unicode_compatible
 class Vocabularies(object):
@@ -101,6 +107,9 @@ class ConceptScheme(object):
 
         self.whitespace = options.get('whitespace') or '-'
 
+        # Generated scheme URIs, keyed by the arguments to uri()
+        self._uri_cache = {}
+
     def with_edition(self, edition):
         # Get a specific edition of this scheme
         return ConceptScheme(self.type, self.code, edition, self.options)
@@ -111,6 +120,18 @@ class ConceptScheme(object):
         return u'%s' % (self.code)
 
     def uri(self, uri_type, **kwargs):
+        # The scheme URIs are generated for every record, so we cache those.
+        # There are only a few of them (one per table and edition), so the
+        # cache stays small. Concept URIs are generated every time.
+        if uri_type != 'scheme':
+            return self._generate_uri(uri_type, **kwargs)
+        key = tuple(sorted(kwargs.items()))
+        uri = self._uri_cache.get(key)
+        if uri is None:
+            uri = self._uri_cache[key] = self._generate_uri(uri_type, **kwargs)
+        return uri
+
+    def _generate_uri(self, uri_type, **kwargs):
         if uri_type not in self.uri_templates:
             raise ValueError('Unknown URI type: %s' % uri_type)
 
@@ -127,7 +148,7 @@ class ConceptScheme(object):
 
         if kwargs.get('control_number') is not None:
             # Remove organization prefix in parenthesis:
-            kwargs['control_number'] = re.sub(r'^\(.+\)(.+)$', '\\1', kwargs['control_number'])
+            kwargs['control_number'] = ORG_PREFIX.sub('\\1', kwargs['control_number'])
 
         # Process field[start:end]
 
@@ -148,11 +169,7 @@ class ConceptScheme(object):
 
             return formatter_str.format(value)
 
-        uri_template = re.sub(
-            r'\{(?P<param>[a-z_]+)(?:\[(?P<start>\d+)?:(?P<end>\d+)?\])?(?P<formatter>[:!][^\}]+)?\}',
-            process_formatter,
-            uri_template
-        )
+        uri_template = TEMPLATE_FIELD.sub(process_formatter, uri_template)
 
         uri = uri_template.format(**kwargs)
 
@@ -0,0 +1,96 @@
+# encoding=utf8
+from rdflib.namespace import RDF, SKOS
+
+
+def serialize_term(term, namespace_manager=None):
+    # Serialize a term as Turtle, using the prefixes of the namespace manager
+    # where possible. Like the Turtle serializer, this raises an exception
+    # for URIs that are not valid.
+    return term.n3(namespace_manager).encode('utf-8')
+
+
+class StreamingTurtleWriter(object):
+    """Write triples to a binary stream as Turtle as soon as they are added.
+
+    Can be passed to process_records() in place of a Graph when the triples do
+    not need to be kept in memory. Each batch of triples added with addN()
+    is written as one block per subject. Unlike the OrderedTurtleSerializer,
+    the subjects are written in the order they are added, not sorted.
+    There is no add() method, since a single triple would become a block of
+    its own; triples should be added in batches with addN().
+    """
+
+    # Objects that are repeated for (almost) every record
+    constant_terms = [RDF.nil, SKOS.Concept]
+
+    def __init__(self, stream, namespace_manager=None):
+        self.stream = stream
+        self.count = 0
+        self.namespace_manager = namespace_manager
+        self._terms = {}
+        if namespace_manager is not None:
+            self.write_prefixes(namespace_manager)
+        for term in self.constant_terms:
+            self._terms[term] = serialize_term(term, namespace_manager)
+        self._terms[RDF.type] = b'a'
+
+    def __len__(self):
+        return self.count
+
+    def write_prefixes(self, namespace_manager):
+        lines = []
+        for prefix, namespace in namespace_manager.namespaces():
+            if prefix:
+                lines.append(u'@prefix %s: <%s> .\n' % (prefix, namespace))
+        lines.append(u'\n')
+        self.stream.write(u''.join(lines).encode('utf-8'))
+
+    def write_subject(self, subject, predicate_objects):
+        terms = self._terms
+        namespace_manager = self.namespace_manager
+        lines = []
+        for p, o in predicate_objects:
+            # The set of predicates is small, so we cache all of them.
+            pred = terms.get(p)
+            if pred is None:
+                pred = terms[p] = serialize_term(p, namespace_manager)
+
+            obj = terms.get(o)
+            if obj is None:
+                obj = serialize_term(o, namespace_manager)
+
+            lines.append(pred + b' ' + obj)
+
+        if len(lines) == 0:
+            return
+        self.stream.write(serialize_term(subject, namespace_manager) + b' ' + b' ;\n    '.join(lines) + b' .\n\n')
+        self.count += len(lines)
+
+    def addN(self, quads):
+        # Like Graph.addN(), but the context is ignored.
+        # Group the predicates and objects by subject, keeping the order of the subjects.
+        subjects = []
+        predicate_objects = {}
+        for s, p, o, _ in quads:
+            if s not in predicate_objects:
+                subjects.append(s)
+                predicate_objects[s] = []
+            predicate_objects[s].append((p, o))
+
+        for s in subjects:
+            self.write_subject(s, predicate_objects[s])
+
+
+class TripleList(list):
+    """Collect triples in a plain list.
+
+    Used in place of a Graph by the worker processes, which send the triples
+    back to the main process rather than keeping a graph of their own.
+    """
+
+    def add(self, triple):
+        self.append(triple)
+
+    def addN(self, quads):
+        # Like Graph.addN(). The context is ignored.
+        self.extend((s, p, o) for s, p, o, _ in quads)
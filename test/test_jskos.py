@@ -0,0 +1,54 @@
+# encoding=utf-8
+import json
+import pytest
+import rdflib_jsonld.serializer as json_ld
+
+from mc2skos.mc2skos import convert_records, process_records, record_to_jskos
+from mc2skos.reader import MarcFileReader
+from mc2skos.vocabularies import Vocabularies
+
+
+with open('mc2skos/vocabularies.yml') as fp:
+    vocabularies = Vocabularies()
+    vocabularies.load_yaml(fp)
+
+with open('mc2skos/jskos-context.json') as fp:
+    context = json.load(fp)
+
+
+def normalize(value):
+    # Ignore the order of values, which is arbitrary when going via a graph.
+    # The memberList is an ordered list (@list), so its order is kept.
+    if isinstance(value, dict):
+        return {key: [normalize(val) for val in vals] if key == 'memberList' else normalize(vals)
+                for key, vals in value.items()}
+    if isinstance(value, list):
+        return sorted((normalize(val) for val in value), key=lambda val: json.dumps(val, sort_keys=True))
+    return value
+
+
+@pytest.mark.parametrize('filename', [
+    'examples/ddc21en-003.54.xml',
+    'examples/ddc21en-6--98324.xml',
+    'examples/ddc23de-001.xml',
+    'examples/ddc23no-002.0216.xml',
+    'examples/ddc23no-539.60113.xml',
+    'examples/humord-c28807.xml',
+    'examples/rvk.xml',
+])
+def test_record_to_jskos_matches_json_ld(filename):
+    options = {
+        'vocabularies': vocabularies,
+        'include_altlabels': True,
+        'include_components': True,
+        'include_webdewey': True,
+    }
+
+    graph = process_records(MarcFileReader(filename).records(), **options)
+    expect = json_ld.from_rdf(graph, context)
+    del expect['@context']
+    expect = json.loads(json.dumps(expect['@graph'] if '@graph' in expect else [expect]))
+
+    jskos = list(convert_records(MarcFileReader(filename).records(), record_to_jskos, **options))
+
+    assert normalize(jskos) == normalize(expect)
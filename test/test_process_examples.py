@@ -11,6 +11,7 @@ from mc2skos.mc2skos import process_records
 from mc2skos.vocabularies import Vocabularies
 from rdflib.namespace import RDF, SKOS, OWL, DCTERMS, Namespace
 from rdflib import URIRef, Literal, Graph
+from rdflib.compare import isomorphic
 
 
 with open('mc2skos/vocabularies.yml') as fp:
@@ -117,5 +118,28 @@ def test_authority_example(marc, match):
     check_processing(marc, expect, include_altlabels=True)
     vocabularies.set_default_scheme()
 
+
+def test_parallel_processing():
+    options = {'vocabularies': vocabularies, 'include_altlabels': True, 'include_webdewey': True}
+    for filename in ['examples/rvk.xml', 'examples/ddc23no-539.60113.xml']:
+        expect = process_records(MarcFileReader(filename).records(), **options)
+        graph = process_records(MarcFileReader(filename).records(), processes=2, **options)
+
+        assert len(graph) == len(expect)
+        assert isomorphic(graph, expect)
+
+
+def test_parallel_processing_malformed_file(tmpdir):
+    # Errors from the XML parser should reach the caller, not be sent to the workers
+    with open('examples/rvk.xml', 'rb') as fp:
+        data = fp.read()
+    filename = str(tmpdir.join('truncated.xml'))
+    with open(filename, 'wb') as fp:
+        fp.write(data[:len(data) * 2 // 3])
+
+    with pytest.raises(etree.XMLSyntaxError):
+        process_records(MarcFileReader(filename).records(), processes=2, vocabularies=vocabularies)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -3,7 +3,8 @@ import copy
 import unittest
 import pytest
 from lxml import etree
-from mc2skos.mc2skos import process_record, ClassificationRecord, Constants, InvalidRecordError
+from mc2skos.constants import Constants
+from mc2skos.mc2skos import process_record, ClassificationRecord, InvalidRecordError
 from mc2skos.vocabularies import Vocabularies
 from rdflib.namespace import RDF, SKOS, Namespace
 from rdflib import URIRef, Literal, Graph, BNode
@@ -73,6 +74,7 @@ class TestClassificationRecord(unittest.TestCase):
         assert rec.display is True
         assert rec.synthesized is False
         assert rec.notation == '811-818:2;4'
+        assert rec.notation_literal == Literal('T811-818:2;4')
         assert len(rec.relations) == 1
         assert rec.relations[0]['uri'] == 'http://dewey.info/class/811-818/e23/'
         assert rec.relations[0]['relation'] == SKOS.broader
@@ -198,9 +200,9 @@ class TestClassificationRecord(unittest.TestCase):
         assert rec.synthesized is True
         assert rec.prefLabel is None
         assert rec.altLabel == [
-            {'term': 'Personlige datamaskiner--grafikkprogrammer'},
-            {'term': 'CorelDRAW'},
-            {'term': 'CorelDRAW!'},
+            'Personlige datamaskiner--grafikkprogrammer',
+            'CorelDRAW',
+            'CorelDRAW!',
         ]
 
     def testSynthesizedNumberComponents1(self):
@@ -381,9 +383,9 @@ class TestClassificationRecord(unittest.TestCase):
         ''', options=self.options)
 
         assert rec.altLabel == [
-            {'term': 'Analytisk kjemi--organisk kjemi'},
-            {'term': 'Kjemisk analyse--organisk kjemi'},
-            {'term': 'Organisk kjemi--analytisk kjemi'}]
+            'Analytisk kjemi--organisk kjemi',
+            'Kjemisk analyse--organisk kjemi',
+            'Organisk kjemi--analytisk kjemi']
 
 
 class TestProcessRecord(unittest.TestCase):
@@ -453,9 +455,11 @@ class TestProcessRecord(unittest.TestCase):
         '''
         graph = Graph()
         self.vocabularies.set_default_scheme('http://test/{object}')
-        process_record(graph, rec, vocabularies=self.vocabularies)
+        added = process_record(graph, rec, vocabularies=self.vocabularies)
         uri = URIRef(u'http://test/003.5')
 
+        assert added == len(graph) == 5
+
         assert set(graph) == set([
             (uri, RDF.type, SKOS.Concept),
             (uri, SKOS.broader, URIRef(u'http://test/003')),
@@ -0,0 +1,58 @@
+# encoding=utf-8
+import io
+import pytest
+from rdflib import Graph, Literal, URIRef
+from rdflib.compare import isomorphic
+from rdflib.namespace import DCTERMS, SKOS, XSD
+
+from mc2skos.mc2skos import process_records
+from mc2skos.reader import MarcFileReader
+from mc2skos.vocabularies import Vocabularies
+from mc2skos.writer import StreamingTurtleWriter
+
+
+with open('mc2skos/vocabularies.yml') as fp:
+    vocabularies = Vocabularies()
+    vocabularies.load_yaml(fp)
+
+
+def test_streaming_turtle_writer_matches_graph():
+    options = {'vocabularies': vocabularies, 'include_altlabels': True, 'include_components': True}
+    for filename in ['examples/rvk.xml', 'examples/ddc23no-539.60113.xml']:
+        expected = process_records(MarcFileReader(filename).records(), **options)
+
+        out = io.BytesIO()
+        writer = StreamingTurtleWriter(out, expected.namespace_manager)
+        writer = process_records(MarcFileReader(filename).records(), writer, **options)
+        assert len(writer) == len(expected)
+
+        graph = Graph()
+        graph.parse(data=out.getvalue().decode('utf-8'), format='turtle')
+        assert isomorphic(graph, expected)
+
+
+def test_streaming_turtle_writer_output():
+    graph = Graph()
+    graph.namespace_manager.bind('skos', SKOS)
+    graph.namespace_manager.bind('dcterms', DCTERMS)
+    out = io.BytesIO()
+    writer = StreamingTurtleWriter(out, graph.namespace_manager)
+    out.seek(0)
+    out.truncate()
+
+    uri = URIRef('http://example.org/a')
+    writer.addN([
+        (uri, SKOS.prefLabel, Literal(u'Line "one"\nLine two', lang='nb'), None),
+        (uri, URIRef('http://example.org/vocab/has%20space'), uri, None),
+        (uri, DCTERMS.created, Literal('2018-02-08', datatype=XSD.date), None),
+    ])
+
+    assert out.getvalue() == (u'<http://example.org/a> skos:prefLabel """Line "one"\nLine two"""@nb ;\n'
+                              u'    <http://example.org/vocab/has%20space> <http://example.org/a> ;\n'
+                              u'    dcterms:created "2018-02-08"^^xsd:date .\n\n').encode('utf-8')
+
+
+def test_streaming_turtle_writer_invalid_uri():
+    writer = StreamingTurtleWriter(io.BytesIO(), Graph().namespace_manager)
+    with pytest.raises(Exception):
+        writer.addN([(URIRef('http://example.org/a b'), SKOS.notation, Literal('1'), None)])